@@ -15,19 +15,34 @@ Usage:
 """
 
 import argparse
+import codecs
 import csv
+import functools
+import math
+import random
 import re
 import sys
 import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
+import lxml.etree
 import requests
+import requests_cache
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 # Resolve paths relative to this script's directory
 SCRIPT_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = SCRIPT_DIR / "output"
+HTTP_CACHE_PATH = SCRIPT_DIR / ".http_cache"
+
+# How long cached pages are reused before being fetched again
+CACHE_EXPIRE_AFTER = 24 * 3600
 
 HEADERS = {
     "User-Agent": (
@@ -37,6 +52,19 @@ HEADERS = {
     ),
 }
 
+# Connection pool size for the module-level session; main() sizes the pool
+# from --concurrency instead
+POOL_SIZE = 16
+
+# Bytes per read when streaming guide pages into the parser
+CHUNK_SIZE = 64 * 1024
+
+# Retry policy for rate-limited (429) and transient (5xx / network) failures
+MAX_RETRIES = 4
+MAX_BACKOFF = 60.0
+# Longest Retry-After we wait out; a server asking for more gets no retry
+MAX_RETRY_AFTER = 300.0
+
 CSV_COLUMNS = [
     "Category",
     "Titles",
@@ -49,7 +77,15 @@ CSV_COLUMNS = [
     "URL",
 ]
 
-SKIP_HEADINGS = {
+# Blank row template; copied for each data row, yielded as-is for separators
+EMPTY_ROW = ("",) * len(CSV_COLUMNS)
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# Elements the guide parser reports: headings plus main-content containers
+PARSE_TAGS = HEADING_TAGS + ("article", "main")
+
+SKIP_HEADINGS = frozenset({
     "legal notice",
     "left navigation",
     "copyright",
@@ -59,7 +95,7 @@ SKIP_HEADINGS = {
     "learn",
     "try, buy, & sell",
     "communities",
-}
+})
 
 BOILERPLATE_SUFFIXES = [
     "Copy linkLink copied to clipboard!",
@@ -70,18 +106,177 @@ BOILERPLATE_SUFFIXES = [
     " to clipboard!",
 ]
 
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def create_session(
+    cache_path: Path | None = None, pool_size: int = POOL_SIZE
+) -> requests.Session:
+    """
+    Create a requests session that keeps connections to the docs host alive.
+
+    Reusing one session lets every fetch share a pooled TLS connection
+    instead of paying a fresh handshake per guide. Retries are handled by
+    fetch_with_backoff() so that 429 responses can honour Retry-After.
+
+    pool_size should be at least the number of threads sharing the session,
+    or urllib3 discards the extra connections instead of reusing them.
+
+    If cache_path is given, successful responses are cached in a SQLite
+    database there so reruns don't refetch unchanged pages.
+    """
+    if cache_path:
+        session = requests_cache.CachedSession(
+            str(cache_path),
+            backend="sqlite",
+            expire_after=CACHE_EXPIRE_AFTER,
+            allowable_codes=(200,),
+        )
+    else:
+        session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = create_session()
+
+
+def retry_after_seconds(response: requests.Response) -> float:
+    """Read how long a rate-limited response asks us to wait."""
+    value = response.headers.get("Retry-After") or response.headers.get(
+        "X-RateLimit-Reset"
+    )
+    if not value:
+        return MAX_BACKOFF
+    try:
+        wait = float(value)
+    except ValueError:
+        # Retry-After may also be an HTTP date
+        try:
+            reset = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return MAX_BACKOFF
+        # A "-0000" zone parses as naive; HTTP dates are always UTC
+        if reset.tzinfo is None:
+            reset = reset.replace(tzinfo=timezone.utc)
+        wait = (reset - datetime.now(timezone.utc)).total_seconds()
+    else:
+        if not math.isfinite(wait):
+            return MAX_BACKOFF
+        # X-RateLimit-Reset is often an epoch timestamp rather than a delay
+        if wait > 1e9:
+            wait -= time.time()
+    return max(wait, 0.0)
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt."""
+    return min(MAX_BACKOFF, 2**attempt + random.random())
+
+
+def fetch_with_backoff(
+    url: str, timeout: float, max_retries: int = MAX_RETRIES, stream: bool = False
+) -> requests.Response:
+    """
+    GET a URL, retrying rate-limited and transient failures.
+
+    429 responses wait the full Retry-After (or X-RateLimit-Reset) the server
+    asks for, unless that exceeds MAX_RETRY_AFTER, in which case the 429 is
+    returned straight away. 5xx responses and connection errors back off
+    exponentially. The last response is returned as-is, so callers still use
+    raise_for_status().
+    """
+    for attempt in range(max_retries + 1):
+        last_attempt = attempt == max_retries
+        try:
+            response = SESSION.get(url, timeout=timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+            time.sleep(backoff_seconds(attempt))
+            continue
+
+        if response.status_code == 429:
+            wait = retry_after_seconds(response)
+            if wait > MAX_RETRY_AFTER:
+                print(f"  HTTP 429 for {url}, server asked to wait {wait:.0f}s; "
+                      "giving up", file=sys.stderr)
+                return response
+        elif response.status_code >= 500:
+            wait = backoff_seconds(attempt)
+        else:
+            return response
+
+        if last_attempt:
+            return response
+        # Release the connection before waiting (matters for streamed bodies)
+        response.close()
+        print(f"  HTTP {response.status_code} for {url}, retrying in {wait:.1f}s",
+              file=sys.stderr)
+        time.sleep(wait)
+
+
+@functools.lru_cache(maxsize=None)
+def lxml_encoding(label: str) -> str | None:
+    """
+    Map a charset label to a name libxml2 accepts, or None if it has none.
+
+    libxml2 rejects some labels Python and browsers accept (e.g. "latin-1"),
+    so fall back to Python's canonical codec name before giving up.
+    """
+    candidates = [label]
+    try:
+        candidates.append(codecs.lookup(label).name)
+    except LookupError:
+        pass
+    for name in candidates:
+        try:
+            lxml.etree.HTMLParser(encoding=name)
+        except LookupError:
+            continue
+        return name
+    return None
+
+
+def declared_encoding(response: requests.Response) -> str | None:
+    """
+    Return the charset from the Content-Type header, if the server sent one.
+
+    Unlike response.encoding this doesn't fall back to ISO-8859-1, so pages
+    without a header charset are left for the parser to sniff from <meta>.
+    Labels lxml can't decode are treated as undeclared for the same reason.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset":
+            label = value.strip("\"' ")
+            return lxml_encoding(label) if label else None
+    return None
+
+
+def substring_matcher(values):
+    """
+    Compile case-insensitive substring filters into a single regex search.
+
+    The returned function expects already-lowercased text, so each item is
+    lowercased once and scanned once regardless of how many filters there are.
+    """
+    return re.compile("|".join(re.escape(v.lower()) for v in values)).search
+
 
 def filter_guides(guides, categories=None, titles=None):
     """Filter guides by category and/or title (case-insensitive substring)."""
     filtered = guides
     if categories:
-        cats_lower = [c.lower() for c in categories]
-        filtered = [g for g in filtered
-                    if any(c in g["category"].lower() for c in cats_lower)]
+        match_category = substring_matcher(categories)
+        filtered = [g for g in filtered if match_category(g["category"].lower())]
     if titles:
-        titles_lower = [t.lower() for t in titles]
-        filtered = [g for g in filtered
-                    if any(t in g["title"].lower() for t in titles_lower)]
+        match_title = substring_matcher(titles)
+        filtered = [g for g in filtered if match_title(g["title"].lower())]
     return filtered
 
 
@@ -89,12 +284,12 @@ def filter_headings(headings, chapters=None):
     """Filter headings to only include matching h2 chapters and their children."""
     if not chapters:
         return headings
-    chaps_lower = [c.lower() for c in chapters]
+    match_chapter = substring_matcher(chapters)
     filtered = []
     include_children = False
     for h in headings:
         if h["level"] == 2:
-            include_children = any(c in h["text"].lower() for c in chaps_lower)
+            include_children = match_chapter(h["text"].lower()) is not None
         if include_children:
             filtered.append(h)
     return filtered
@@ -102,10 +297,16 @@ def filter_headings(headings, chapters=None):
 
 def clean_heading_text(text: str) -> str:
     """Strip Red Hat docs boilerplate suffixes from heading text."""
-    text = " ".join(text.split())
-    for suffix in BOILERPLATE_SUFFIXES:
-        if text.endswith(suffix):
-            text = text[: -len(suffix)].strip()
+    text = WHITESPACE_RE.sub(" ", text).strip()
+    changed = True
+    while changed:
+        changed = False
+        for suffix in BOILERPLATE_SUFFIXES:
+            # removesuffix returns the same object when there's no match
+            stripped = text.removesuffix(suffix)
+            if stripped is not text:
+                text = stripped.rstrip()
+                changed = True
     return text
 
 
@@ -126,122 +327,281 @@ def fetch_landing_page(base_url: str) -> list[dict]:
     Returns a list of dicts: [{category, title, url}, ...]
     """
     base_url = base_url.rstrip("/")
-    response = requests.get(base_url, headers=HEADERS, timeout=30)
+    response = fetch_with_backoff(base_url, timeout=30)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(
+        response.content, "lxml", from_encoding=declared_encoding(response)
+    )
     guides = []
     seen_urls = set()
 
-    for h2 in soup.find_all("h2"):
-        category = clean_heading_text(h2.get_text(strip=True))
-        if should_skip_heading(category):
+    # Resolve the common href shapes without urljoin
+    base = urlparse(base_url)
+    origin = f"{base.scheme}://{base.netloc}"
+
+    # Walk h2s and links together in document order; a link belongs to the
+    # most recent category heading if it sits inside that h2's parent
+    # container. Once a link falls outside it, the section has ended. Links
+    # that match no category yet are kept, since a later h2 may share their
+    # container (e.g. a card whose link comes before its heading).
+    category = None
+    container = None
+    pending = []
+    links = []
+    for el in soup.find_all(["h2", "a"]):
+        if el.name == "h2":
+            category = clean_heading_text(el.get_text(strip=True))
+            container = el.parent
+            if should_skip_heading(category):
+                category = None
+                continue
+            unclaimed = []
+            for link in pending:
+                if any(parent is container for parent in link.parents):
+                    links.append((category, link))
+                else:
+                    unclaimed.append(link)
+            pending = unclaimed
             continue
 
-        # Find guide links within the h2's parent container
-        parent = h2.parent
-        if not parent:
+        if category is not None and not any(
+            parent is container for parent in el.parents
+        ):
+            category = None
+        if category is None:
+            pending.append(el)
+        else:
+            links.append((category, el))
+
+    for category, el in links:
+        href = el.get("href", "")
+        if not href or href.startswith(("#", "javascript:", "mailto:")):
             continue
 
-        links = parent.find_all("a", href=True)
-        for link in links:
-            href = link.get("href", "")
-            if not href or href.startswith(("#", "javascript:", "mailto:")):
+        if href.startswith("/") and not href.startswith("//"):
+            absolute_url = origin + href
+        elif href.startswith(("https://", "http://")):
+            # Guides live on the same host; skip links off-site
+            if urlparse(href).netloc != base.netloc:
                 continue
-
+            absolute_url = href
+        else:
             absolute_url = urljoin(base_url, href)
 
-            # Only include documentation links
-            if "/documentation/" not in absolute_url:
-                continue
+        # Only include documentation links
+        if "/documentation/" not in absolute_url:
+            continue
 
-            # Convert to html-single for full-page fetch
-            guide_url = to_html_single(absolute_url)
+        # Convert to html-single for full-page fetch
+        guide_url = to_html_single(absolute_url)
 
-            # Deduplicate
-            if guide_url in seen_urls:
-                continue
-            seen_urls.add(guide_url)
+        # Deduplicate
+        if guide_url in seen_urls:
+            continue
+        seen_urls.add(guide_url)
 
-            title = clean_heading_text(link.get_text(strip=True))
-            if not title:
-                continue
+        title = clean_heading_text(el.get_text(strip=True))
+        if not title:
+            continue
 
-            guides.append(
-                {
-                    "category": category,
-                    "title": title,
-                    "url": guide_url,
-                }
-            )
+        guides.append(
+            {
+                "category": category,
+                "title": title,
+                "url": guide_url,
+            }
+        )
 
     return guides
 
 
+def element_text(el) -> str:
+    """Concatenate the stripped text nodes of an element (like get_text(strip=True))."""
+    return "".join(s.strip() for s in el.itertext())
+
+
 def find_anchor(h) -> str:
     """Find the best anchor ID for a heading element."""
-    anchor = h.get("id", "")
-    if not anchor:
-        parent = h.parent
-        if parent:
-            anchor = parent.get("id", "")
-    if not anchor:
-        inner_a = h.find("a", id=True) or h.find("a", attrs={"name": True})
-        if inner_a:
-            anchor = inner_a.get("id") or inner_a.get("name", "")
-    return anchor
+    anchor = h.get("id")
+    if anchor:
+        return anchor
+    parent = h.getparent()
+    if parent is not None:
+        anchor = parent.get("id")
+        if anchor:
+            return anchor
+    # First inner <a> carrying an id or name, in one walk of the heading
+    for a in h.iter("a"):
+        anchor = a.get("id") or a.get("name")
+        if anchor:
+            return anchor
+    return ""
+
+
+def content_ranks(el) -> tuple[int, ...]:
+    """
+    Return which main-content patterns an element matches, by priority.
+
+    0: article[aria-live="polite"], 1: article[aria-live], 2: article,
+    3: main (Red Hat docs patterns).
+    """
+    if el.tag == "main":
+        return (3,)
+    if el.tag != "article":
+        return ()
+    aria_live = el.get("aria-live")
+    if aria_live is None:
+        return (2,)
+    if aria_live == "polite":
+        return (0, 1, 2)
+    return (1, 2)
+
+
+def iter_parse_events(chunks, parser):
+    """Feed byte chunks into a pull parser, yielding its events as they arrive."""
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def parse_headings(chunks, url: str, encoding: str | None = None) -> list[dict]:
+    """Parse a guide page from byte chunks and extract its headings."""
+    # Only heading and container events reach Python; the rest of the
+    # document is matched and skipped inside lxml
+    parser = lxml.etree.HTMLPullParser(
+        events=("start", "end"), tag=PARSE_TAGS, encoding=encoding
+    )
+    return extract_headings(iter_parse_events(chunks, parser), url)
+
+
+def prune_before(el) -> None:
+    """Delete everything that precedes an element and its ancestors."""
+    node = el
+    parent = node.getparent()
+    while parent is not None:
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+        parent = node.getparent()
+
+
+def build_heading(h, url: str) -> dict | None:
+    """Build the inventory entry for a heading element, or None to skip it."""
+    # clean_heading_text() already strips, so a single lower() suffices
+    text = clean_heading_text(element_text(h))
+    if not text or text.lower() in SKIP_HEADINGS:
+        return None
+
+    anchor = find_anchor(h)
+    return {
+        "level": int(h.tag[1]),
+        "text": text,
+        "anchor": anchor,
+        "url": f"{url}#{anchor}" if anchor else url,
+    }
+
+
+def extract_headings(events, url: str) -> list[dict]:
+    """
+    Extract headings with their anchor IDs from (event, element) parse events.
+
+    Only heading and container events are expected (see PARSE_TAGS). Each
+    time a heading or container ends outside any open heading, it is cleared
+    and everything before it in the document is deleted. So the tree held at
+    any point is roughly the content since the previous heading, not the
+    whole page. Headings are only taken from the main content area: the first
+    element matching the highest-priority pattern in content_ranks(), or the
+    whole page if none match.
+
+    Returns a list of dicts: [{level, text, anchor, url}, ...]
+    """
+    # First element matching each content pattern, and the headings inside
+    # it; the extra bucket collects every heading on the page. A heading's
+    # slot is taken on its start event so nested headings keep document order
+    containers = [None] * 4
+    buckets = [[] for _ in range(len(containers) + 1)]
+    open_slots = []
+
+    for event, el in events:
+        is_heading = el.tag in HEADING_TAGS
+        if event == "start":
+            if is_heading:
+                slot = [None]
+                ancestors = set(el.iterancestors("article", "main"))
+                for rank, container in enumerate(containers):
+                    if container is not None and container in ancestors:
+                        buckets[rank].append(slot)
+                buckets[-1].append(slot)
+                open_slots.append(slot)
+            else:
+                for rank in content_ranks(el):
+                    if containers[rank] is None:
+                        containers[rank] = el
+            continue
+
+        if is_heading:
+            open_slots.pop()[0] = build_heading(el, url)
+
+        # Drop finished content (text and anchors inside an open heading are
+        # still needed); open ancestors stay in place
+        if not open_slots:
+            el.clear(keep_tail=True)
+            prune_before(el)
+
+    bucket = buckets[-1]
+    for rank, container in enumerate(containers):
+        if container is not None:
+            bucket = buckets[rank]
+            break
+    return [heading for (heading,) in bucket if heading]
 
 
 def fetch_guide_headings(url: str) -> list[dict]:
     """
     Fetch a guide page and extract all headings with their anchor IDs.
 
+    The page is fed to lxml's pull parser chunk by chunk, and the tree is
+    pruned as headings are extracted, so the full document tree is never
+    built. With --no-cache the chunks arrive as the page downloads; with the
+    on-disk cache the body has already been read in full (see below).
+
     Returns a list of dicts: [{level, text, anchor, url}, ...]
     """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=60)
-        response.raise_for_status()
+        # stream=True only streams with a plain session (--no-cache): with the
+        # on-disk cache, requests-cache reads the whole body to store it
+        # before iter_content() yields anything
+        with fetch_with_backoff(url, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            # Only pass an encoding if the server declared one
+            return parse_headings(
+                response.iter_content(CHUNK_SIZE), url, declared_encoding(response)
+            )
     except requests.RequestException as e:
-        print(f"  Failed to fetch: {e}", file=sys.stderr)
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Find the main content area (Red Hat docs patterns)
-    article = None
-    for selector in [
-        'article[aria-live="polite"]',
-        "article[aria-live]",
-        "article",
-        "main",
-    ]:
-        article = soup.select_one(selector)
-        if article:
-            break
-    if not article:
-        article = soup
-
-    # Iterate all headings in document order
-    headings = []
-    for h in article.find_all(re.compile(r"^h[1-6]$")):
-        text = clean_heading_text(h.get_text(strip=True))
-        if not text or should_skip_heading(text):
-            continue
+        print(f"  Failed to fetch {url}: {e}", file=sys.stderr)
+    except lxml.etree.ParseError as e:
+        print(f"  Failed to parse {url}: {e}", file=sys.stderr)
+    return []
 
-        level = int(h.name[1])
-        anchor = find_anchor(h)
-        heading_url = f"{url}#{anchor}" if anchor else url
 
-        headings.append(
-            {
-                "level": level,
-                "text": text,
-                "anchor": anchor,
-                "url": heading_url,
-            }
-        )
+def fetch_guide(guide: dict, delay: float = 0.0, chapters=None) -> dict:
+    """
+    Fetch headings for one guide, storing them on the guide dict.
 
-    return headings
+    Sleeps for ``delay`` seconds first so each worker thread paces its own
+    requests; pass 0 for a worker's first job so no pause is wasted at either
+    end of the crawl.
+    """
+    if delay > 0:
+        time.sleep(delay)
+    headings = fetch_guide_headings(guide["url"])
+    if chapters:
+        headings = filter_headings(headings, chapters)
+    guide["headings"] = headings
+    return guide
 
 
 def hyperlink(url: str, text: str) -> str:
@@ -252,9 +612,9 @@ def hyperlink(url: str, text: str) -> str:
     return f'=HYPERLINK("{safe_url}","{safe_text}")'
 
 
-def build_csv_rows(guides: list[dict]) -> list[list[str]]:
+def iter_csv_rows(guides: list[dict]) -> Iterator[Sequence[str]]:
     """
-    Build CSV rows from guides and their headings.
+    Yield CSV rows for guides and their headings.
 
     Each cell value is wrapped in =HYPERLINK("url","text") so it becomes
     a clickable link when opened in Google Sheets or Excel.
@@ -267,7 +627,6 @@ def build_csv_rows(guides: list[dict]) -> list[list[str]]:
     - h5 -> Sub-sub-sections (col 5)
     - h6 -> Details (col 6)
     """
-    rows = []
     prev_category = None
 
     for guide in guides:
@@ -280,38 +639,47 @@ def build_csv_rows(guides: list[dict]) -> list[list[str]]:
         prev_category = category
 
         # Title row for this guide
-        row = [""] * len(CSV_COLUMNS)
+        row = list(EMPTY_ROW)
         if show_category:
             row[0] = show_category
         row[1] = hyperlink(guide["url"], title)
-        rows.append(row)
-
-        # Skip h1 (page title) since we have the title from the landing page
-        content_headings = [h for h in headings if h["level"] >= 2]
+        yield row
 
         # Heading rows
-        for heading in content_headings:
-            row = [""] * len(CSV_COLUMNS)
+        for heading in headings:
             level = heading["level"]
+            # Skip h1 (page title) since we have the title from the landing page
+            if level < 2:
+                continue
+            row = list(EMPTY_ROW)
             # h2=col 2 (Chapters), h3=col 3 (Sections), h4=col 4, h5=col 5, h6=col 6
             col_index = level
             if col_index < len(CSV_COLUMNS) - 2:  # Leave room for Notes + URL
                 row[col_index] = hyperlink(heading["url"], heading["text"])
-            rows.append(row)
+            yield row
 
         # Blank separator row after each guide
-        rows.append([""] * len(CSV_COLUMNS))
+        yield EMPTY_ROW
 
-    return rows
 
+def write_csv(rows: Iterable[Sequence[str]], output_path: Path) -> int:
+    """
+    Stream rows to a CSV file, creating parent directories if needed.
 
-def write_csv(rows: list[list[str]], output_path: Path) -> None:
-    """Write rows to a CSV file, creating parent directories if needed."""
+    Returns the number of data rows written (excluding the header).
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
+    row_count = 0
+    with open(output_path, "w", newline="", encoding="utf-8",
+              buffering=1 << 20) as f:
+        # Quote every cell so the HYPERLINK formulas' embedded quotes
+        # round-trip the same way in every spreadsheet tool
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
         writer.writerow(CSV_COLUMNS)
-        writer.writerows(rows)
+        for row in rows:
+            writer.writerow(row)
+            row_count += 1
+    return row_count
 
 
 def slugify_product(url: str) -> str:
@@ -348,8 +716,27 @@ def main():
     parser.add_argument(
         "--delay",
         type=float,
-        default=1.0,
-        help="Delay in seconds between page fetches (default: 1.0)",
+        default=0.0,
+        help="Extra delay in seconds between page fetches per worker, so at "
+             "most about concurrency/delay fetches per second (default: 0; "
+             "rate limits are handled by backing off)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-j",
+        type=int,
+        default=8,
+        help="Number of guides to fetch in parallel (default: 8)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the on-disk HTTP cache",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Discard cached pages and fetch everything again",
     )
     parser.add_argument(
         "--category",
@@ -372,6 +759,16 @@ def main():
 
     args = parser.parse_args()
 
+    # One pooled connection per fetch thread; cache responses on disk so
+    # reruns with different filters are cheap
+    global SESSION
+    SESSION = create_session(
+        cache_path=None if args.no_cache else HTTP_CACHE_PATH,
+        pool_size=max(1, args.concurrency),
+    )
+    if args.refresh_cache and not args.no_cache:
+        SESSION.cache.clear()
+
     # Default output path: output/<product>_content_inventory.csv
     if args.output:
         output_path = Path(args.output)
@@ -397,27 +794,37 @@ def main():
         guides = guides[: args.limit]
         print(f"Limited to first {args.limit} guides")
 
-    # Fetch headings for each guide
-    for i, guide in enumerate(guides, 1):
-        print(f"[{i}/{len(guides)}] {guide['title'][:60]}...")
-        guide["headings"] = fetch_guide_headings(guide["url"])
-        if args.chapter:
-            guide["headings"] = filter_headings(guide["headings"], args.chapter)
-        heading_count = len(guide["headings"])
-        print(f"  {heading_count} headings extracted")
-
-        if i < len(guides):
-            time.sleep(args.delay)
-
-    # Build and write CSV
-    rows = build_csv_rows(guides)
-    write_csv(rows, output_path)
+    if len(guides) == 1:
+        # Single guide (e.g. --limit 1): fetch it directly, no pool or delay
+        guide = fetch_guide(guides[0], chapters=args.chapter)
+        print(f"{guide['title'][:60]}... {len(guide['headings'])} headings extracted")
+    else:
+        # Fetch headings for each guide, several at a time. Each worker parses
+        # its page as it downloads, so parsing overlaps the other fetches.
+        # The first job each worker picks up starts without the delay.
+        workers = max(1, args.concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    fetch_guide, guide, args.delay if i >= workers else 0.0,
+                    args.chapter,
+                )
+                for i, guide in enumerate(guides)
+            ]
+            for i, future in enumerate(as_completed(futures), 1):
+                guide = future.result()
+                heading_count = len(guide["headings"])
+                print(f"[{i}/{len(guides)}] {guide['title'][:60]}... "
+                      f"{heading_count} headings extracted")
+
+    # Stream rows straight into the CSV
+    row_count = write_csv(iter_csv_rows(guides), output_path)
 
     total_headings = sum(len(g.get("headings", [])) for g in guides)
     categories = len(set(g["category"] for g in guides))
     print(f"\nDone! Wrote {output_path}")
     print(f"  {categories} categories, {len(guides)} guides, {total_headings} headings")
-    print(f"  {len(rows)} CSV rows (including separators)")
+    print(f"  {row_count} CSV rows (including separators)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+"""Tests for the HTML extraction in crawl_content_inventory."""
+
+import requests
+
+import crawl_content_inventory as crawler
+
+BASE_URL = "https://docs.example.com/en/documentation/product/1.0"
+
+
+def make_response(
+    body: str | bytes = b"", charset: str = "utf-8", status_code: int = 200
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = f"text/html; charset={charset}"
+    response._content = body.encode("utf-8") if isinstance(body, str) else body
+    response._content_consumed = True
+    return response
+
+
+def test_landing_page_links_stay_within_category_container(monkeypatch):
+    html = """
+    <html><body>
+    <nav><a href="/en/documentation/product/1.0/html/nav_guide">Nav guide</a></nav>
+    <section>
+      <h2>Get started</h2>
+      <a href="/en/documentation/product/1.0/html/intro">Introduction</a>
+    </section>
+    <section>
+      <a href="/en/documentation/product/1.0/html/overview">Overview</a>
+      <h2>Plan</h2>
+      <a href="/en/documentation/product/1.0/html/sizing">Sizing</a>
+    </section>
+    <section>
+      <h2>Develop</h2>
+      <a href="/en/documentation/product/1.0/html/api">API guide</a>
+    </section>
+    <aside><a href="/en/documentation/product/1.0/html/related">Related</a></aside>
+    <footer>
+      <h2>Learn</h2>
+      <a href="/en/documentation/product/1.0/html/learn">Learn docs</a>
+    </footer>
+    </body></html>
+    """
+    monkeypatch.setattr(
+        crawler, "fetch_with_backoff", lambda url, timeout: make_response(html)
+    )
+
+    guides = crawler.fetch_landing_page(BASE_URL)
+
+    assert [(g["category"], g["title"]) for g in guides] == [
+        ("Get started", "Introduction"),
+        ("Plan", "Overview"),
+        ("Plan", "Sizing"),
+        ("Develop", "API guide"),
+    ]
+    assert guides[0]["url"] == (
+        "https://docs.example.com/en/documentation/product/1.0/html-single/intro"
+    )
+
+
+def test_csv_rows_map_heading_levels_to_columns():
+    guides = [
+        {
+            "category": "Deploy",
+            "title": "Deploying models",
+            "url": "https://example.com/guide",
+            "headings": [
+                {"level": 1, "text": "Title", "url": "https://example.com/guide"},
+                {"level": 2, "text": "Chapter", "url": "https://example.com/guide#c"},
+                {"level": 4, "text": "Sub", "url": "https://example.com/guide#s"},
+            ],
+        },
+    ]
+
+    rows = list(crawler.iter_csv_rows(guides + guides))
+
+    assert [[bool(cell) for cell in row] for row in rows[:4]] == [
+        [True, True, False, False, False, False, False, False, False],
+        [False, False, True, False, False, False, False, False, False],
+        [False, False, False, False, True, False, False, False, False],
+        [False] * len(crawler.CSV_COLUMNS),
+    ]
+    assert rows[1][2] == '=HYPERLINK("https://example.com/guide#c","Chapter")'
+    # Separators share one immutable row, so editing one can't leak into another
+    assert rows[3] is rows[-1] is crawler.EMPTY_ROW
+    assert isinstance(crawler.EMPTY_ROW, tuple)
+
+
+def parse(html: str, chunk_size: int = 16) -> list[dict]:
+    """Run the streaming heading parser over html in small chunks."""
+    data = html.encode("utf-8")
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    return crawler.parse_headings(chunks, "https://example.com/guide")
+
+
+def heading_texts(headings: list[dict]) -> list[str]:
+    return [h["text"] for h in headings]
+
+
+def test_headings_come_from_highest_priority_container():
+    html = """
+    <html><body>
+    <main>
+      <h2>In main only</h2>
+      <article><h2>In plain article</h2></article>
+      <article aria-live="off"><h2>In aria-live article</h2></article>
+      <article aria-live="polite">
+        <h2>In polite article</h2>
+        <h3>Also polite Copy linkLink copied to clipboard!</h3>
+      </article>
+    </main>
+    <footer><h2>Outside containers</h2></footer>
+    </body></html>
+    """
+    assert heading_texts(parse(html)) == ["In polite article", "Also polite"]
+
+
+def test_headings_fall_back_through_container_patterns():
+    article_live = """
+    <main><h2>Main</h2></main>
+    <article><h2>Plain</h2></article>
+    <article aria-live="assertive"><h2>Live</h2></article>
+    """
+    main_only = "<nav><h2>Nav</h2></nav><main><h2>Main</h2></main>"
+    no_container = "<div><h2>One</h2></div><h3>Two</h3>"
+
+    assert heading_texts(parse(article_live)) == ["Live"]
+    assert heading_texts(parse(main_only)) == ["Main"]
+    assert heading_texts(parse(no_container)) == ["One", "Two"]
+
+
+def test_heading_outside_first_article_is_excluded():
+    html = """
+    <header><h2>Left navigation</h2><h3>Site menu</h3></header>
+    <article><h1>Guide</h1><h2 id="c1">Chapter 1</h2></article>
+    <article><h2 id="c2">Second article</h2></article>
+    <aside><h2>Related</h2></aside>
+    """
+    assert heading_texts(parse(html)) == ["Guide", "Chapter 1"]
+
+
+def test_heading_anchor_lookup_order():
+    html = """
+    <article>
+      <h2 id="own">Own id</h2>
+      <section id="parent"><h2>Parent id<a id="inner"></a></h2></section>
+      <h3><span><a name="named"></a></span><a id="later"></a>Nested anchors</h3>
+      <h4>No anchor</h4>
+      <h2>Legal Notice</h2>
+    </article>
+    """
+    headings = parse(html)
+
+    assert [(h["level"], h["text"], h["anchor"]) for h in headings] == [
+        (2, "Own id", "own"),
+        (2, "Parent id", "parent"),
+        (3, "Nested anchors", "named"),
+        (4, "No anchor", ""),
+    ]
+    assert headings[0]["url"] == "https://example.com/guide#own"
+    assert headings[3]["url"] == "https://example.com/guide"
+
+
+def test_nested_headings_keep_document_order():
+    html = """
+    <article>
+      <h3 id="outer">Outer<h4 id="inner">Inner</h4></h3>
+      <h2 id="after">After</h2>
+    </article>
+    """
+    assert [(h["level"], h["anchor"]) for h in parse(html)] == [
+        (3, "outer"),
+        (4, "inner"),
+        (2, "after"),
+    ]
+
+
+def test_guide_with_charset_label_libxml2_rejects(monkeypatch):
+    # libxml2 has no "latin-1" or "x-user-defined" label; these used to raise
+    # LookupError out of the worker and abort the whole crawl
+    html = "<article><h2 id='cafe'>Caf\u00e9 menu</h2></article>"
+    for charset, text in [
+        ("latin-1", "Caf\u00e9 menu"),
+        ("x-user-defined", None),
+    ]:
+        body = html.encode("latin-1")
+        monkeypatch.setattr(
+            crawler,
+            "fetch_with_backoff",
+            lambda url, timeout, stream=False: make_response(body, charset),
+        )
+
+        headings = crawler.fetch_guide_headings("https://example.com/guide")
+
+        assert [h["anchor"] for h in headings] == ["cafe"]
+        if text:
+            assert headings[0]["text"] == text
+
+
+def test_retry_after_header_forms(monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(crawler.time, "time", lambda: now)
+
+    class FrozenDatetime(crawler.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return crawler.datetime.fromtimestamp(now, tz)
+
+    monkeypatch.setattr(crawler, "datetime", FrozenDatetime)
+
+    def wait_for(**headers):
+        response = requests.Response()
+        response.headers.update(headers)
+        return crawler.retry_after_seconds(response)
+
+    # Nov 14 2023 22:13:20 GMT is `now`; these dates are 10 s later
+    assert wait_for(**{"Retry-After": "5"}) == 5.0
+    assert wait_for(**{"Retry-After": "Tue, 14 Nov 2023 22:13:30 GMT"}) == 10.0
+    assert wait_for(**{"Retry-After": "Tue, 14 Nov 2023 22:13:30 -0000"}) == 10.0
+    assert wait_for(**{"X-RateLimit-Reset": str(int(now) + 7)}) == 7.0
+    assert wait_for(**{"Retry-After": "soon"}) == crawler.MAX_BACKOFF
+    assert wait_for(**{"Retry-After": "nan"}) == crawler.MAX_BACKOFF
+    assert wait_for(**{"Retry-After": "-3"}) == 0.0
+    assert wait_for(**{"Retry-After": "600"}) == 600.0
+    assert wait_for() == crawler.MAX_BACKOFF
+
+
+class FakeSession:
+    """Session stand-in that replays a fixed list of status codes."""
+
+    def __init__(self, statuses, retry_after=None):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def get(self, url, timeout, stream=False):
+        self.calls += 1
+        response = make_response(status_code=self.statuses.pop(0))
+        if self.retry_after is not None:
+            response.headers["Retry-After"] = self.retry_after
+        return response
+
+
+def test_fetch_with_backoff_waits_out_rate_limit(monkeypatch):
+    session = FakeSession([429, 200], retry_after="120")
+    sleeps = []
+    monkeypatch.setattr(crawler, "SESSION", session)
+    monkeypatch.setattr(crawler.time, "sleep", sleeps.append)
+
+    response = crawler.fetch_with_backoff("https://example.com", timeout=1)
+
+    assert response.status_code == 200
+    assert session.calls == 2
+    assert sleeps == [120.0]
+
+
+def test_fetch_with_backoff_gives_up_on_long_retry_after(monkeypatch):
+    session = FakeSession([429, 200], retry_after="3600")
+    sleeps = []
+    monkeypatch.setattr(crawler, "SESSION", session)
+    monkeypatch.setattr(crawler.time, "sleep", sleeps.append)
+
+    response = crawler.fetch_with_backoff("https://example.com", timeout=1)
+
+    assert response.status_code == 429
+    assert session.calls == 1
+    assert sleeps == []
+
+
+def test_fetch_with_backoff_retries_server_errors(monkeypatch):
+    session = FakeSession([503] * 5)
+    sleeps = []
+    monkeypatch.setattr(crawler, "SESSION", session)
+    monkeypatch.setattr(crawler.time, "sleep", sleeps.append)
+    monkeypatch.setattr(crawler.random, "random", lambda: 0.5)
+
+    response = crawler.fetch_with_backoff(
+        "https://example.com", timeout=1, max_retries=4
+    )
+
+    assert response.status_code == 503
+    assert session.calls == 5
+    assert sleeps == [1.5, 2.5, 4.5, 8.5]